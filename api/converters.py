@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+
+class SignedIntConverter:
+    """Like Django's "int" converter, but also matches negative ids.
+
+    No stored id is negative, so those reach the views and get the API's JSON
+    not-found response instead of failing URL resolution.
+    """
+
+    regex = "-?[0-9]+"
+
+    def to_python(self, value: str) -> int:
+        return int(value)
+
+    def to_url(self, value: int) -> str:
+        return str(value)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.repositories import JsonRoomsRepository, JsonStudentsRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Coerce the JSON data files to the types the API writes, so reads can use them as-is. "
+        "Files already in that form are left untouched."
+    )
+
+    def handle(self, *args, **options):
+        for repo in (JsonRoomsRepository(), JsonStudentsRepository()):
+            if repo.normalize():
+                self.stdout.write(f"Normalized {repo.file_path}")
+            else:
+                self.stdout.write(f"{repo.file_path} is already normalized; left untouched")
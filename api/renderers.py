@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# Types orjson does not handle natively (Decimal, lazy strings, ...) are
+# encoded the same way DRF's JSONRenderer would.
+_dumps = partial(orjson.dumps, default=JSONEncoder().default)
+
+
+# Target size of the chunks produced by iter_json_array
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(items: Iterable[Any]) -> Iterator[bytes]:
+    """Encode `items` as one JSON array, yielding it in chunks of roughly STREAM_CHUNK_SIZE bytes"""
+    buffer = bytearray(b"[")
+    separator = b""
+    for item in items:
+        buffer += separator
+        buffer += _dumps(item)
+        separator = b","
+        if len(buffer) >= STREAM_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]"
+    yield bytes(buffer)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson instead of the stdlib encoder"""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[Mapping[str, Any]] = None) -> bytes:
+        if data is None:
+            return b""
+        return _dumps(data)
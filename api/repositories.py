@@ -1,27 +1,73 @@
 from __future__ import annotations
 
-import json
+import mmap
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager, suppress
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Iterable, List, Optional
+from functools import lru_cache
+from typing import AbstractSet, Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import orjson
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 
 
-# SOLID: Define repository interfaces and JSON-backed implementations
+# SOLID: Define repository interfaces and JSON- and SQLite-backed implementations
 
 
 class RepositoryError(Exception):
     pass
 
 
-@dataclass
+def _parse_json_file(file_path: str) -> Any:
+    # Parse straight from a read-only mapping of the file, without copying it
+    # into a Python bytes object first. Empty files cannot be mapped.
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+# Range of a SQLite INTEGER (and of orjson's integers). No stored id lies
+# outside it, so a larger lookup key can only mean "not found".
+INT64_MIN = -(2 ** 63)
+INT64_MAX = 2 ** 63 - 1
+
+
+def _in_int64(value: int) -> bool:
+    return INT64_MIN <= value <= INT64_MAX
+
+
+def _int_set(values: Iterable[int]) -> AbstractSet[int]:
+    # Filters parsed by the views already arrive as frozensets of ints and are
+    # used as-is unless they hold ids out of range, which are dropped
+    if isinstance(values, frozenset):
+        if not values or (min(values) >= INT64_MIN and max(values) <= INT64_MAX):
+            return values
+    return frozenset(v for v in map(int, values) if _in_int64(v))
+
+
+# How birthdays are stored, and the only format the API accepts and returns
+BIRTHDAY_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+# Records are validated on write, so they are built straight from the stored fields
+@dataclass(slots=True, frozen=True)
 class Room:
     id: int
     name: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "name": self.name}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Student:
     id: int
     name: str
@@ -29,14 +75,62 @@ class Student:
     sex: str
     birthday: datetime
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "room": self.room,
+            "sex": self.sex,
+            "birthday": self.birthday.strftime(BIRTHDAY_FORMAT),
+        }
+
+
+@dataclass
+class RoomsIndex:
+    # Rooms in file order, plus positions into `rooms` by id
+    rooms: List[Room]
+    by_id: Dict[int, int]
+    # Highest id; filled in by the first create on this snapshot
+    max_id: Optional[int] = None
+
 
-class RoomsRepository:
+@dataclass
+class StudentsIndex:
+    # JSON-ready student records in file order, plus positions into `records`
+    records: List[Dict[str, Any]]
+    by_id: Dict[int, int]
+    by_room: Dict[int, List[int]]
+    # Highest id; filled in by the first create on this snapshot
+    max_id: Optional[int] = None
+
+
+class Repository:
+    def last_modified_ns(self) -> int:
+        raise NotImplementedError
+
+    def version(self) -> Tuple[int, str]:
+        # (modification time in ns, token that changes on every write)
+        modified_ns = self.last_modified_ns()
+        return modified_ns, str(modified_ns)
+
+
+class RoomsRepository(Repository):
     def list(self) -> List[Room]:
         raise NotImplementedError
 
     def get(self, room_id: int) -> Optional[Room]:
         raise NotImplementedError
 
+    def get_many(self, ids: Iterable[int]) -> List[Room]:
+        raise NotImplementedError
+
+    def existing_ids(self, ids: Iterable[int]) -> AbstractSet[int]:
+        # The subset of `ids` that are stored rooms
+        raise NotImplementedError
+
+    def exists(self, room_id: int) -> bool:
+        raise NotImplementedError
+
     def create(self, name: str) -> Room:
         raise NotImplementedError
 
@@ -47,16 +141,23 @@ class RoomsRepository:
         raise NotImplementedError
 
 
-class StudentsRepository:
+class StudentsRepository(Repository):
     def list(self, *, ids_in: Optional[Iterable[int]] = None, room_in: Optional[Iterable[int]] = None) -> List[Student]:
         raise NotImplementedError
 
+    def list_records(self, *, ids_in: Optional[Iterable[int]] = None, room_in: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
     def get(self, student_id: int) -> Optional[Student]:
         raise NotImplementedError
 
     def create(self, name: str, room: int, sex: str, birthday: datetime) -> Student:
         raise NotImplementedError
 
+    def bulk_create(self, students: List[Dict[str, Any]]) -> List[Student]:
+        # Each item holds create()'s keyword arguments; all are stored in one write
+        raise NotImplementedError
+
     def update(self, student_id: int, name: Optional[str] = None, room: Optional[int] = None, sex: Optional[str] = None, birthday: Optional[datetime] = None) -> Optional[Student]:
         raise NotImplementedError
 
@@ -67,184 +168,805 @@ class StudentsRepository:
         raise NotImplementedError
 
 
+class CombinedRepository(Repository):
+    # Rooms with their students embedded as [{"id", "name"}, ...]
+    def fetch_combined(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def iter_combined(self) -> Iterator[Dict[str, Any]]:
+        # Backends that can produce rooms incrementally override this
+        return iter(self.fetch_combined())
+
+
 class JsonFileRepositoryMixin:
     file_path: str
+    _cache: Optional[Tuple[Tuple[int, int, int], List[Dict[str, Any]], Any]] = None
+
+    def _init_file(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.fsync = settings.JSON_FSYNC
+        # Serializes read-modify-write cycles within the process
+        self._lock = threading.RLock()
+
+    def last_modified_ns(self) -> int:
+        key = self._file_key()
+        return key[1] if key is not None else 0
+
+    def version(self) -> Tuple[int, str]:
+        # _write swaps in a new file, so the inode changes even when mtime doesn't
+        key = self._file_key()
+        if key is None:
+            return 0, "0"
+        return key[1], "-".join(map(str, key))
+
+    def _file_key(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
 
-    def _read(self) -> List[Dict[str, Any]]:
+    def _build_index(self, items: List[Dict[str, Any]]) -> Any:
+        raise NotImplementedError
+
+    @staticmethod
+    def _normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def normalize(self) -> bool:
+        """Coerce the stored records to the types the API writes.
+
+        The file is only replaced when that changes its bytes, so normalized
+        data keeps its inode, mtime and every client's ETag. Returns whether the
+        file was rewritten.
+        """
+        with self._lock:
+            items = [self._normalize_record(record) for record in self._read()]
+            data = self._encode(items)
+            try:
+                with open(self.file_path, "rb") as f:
+                    if f.read() == data:
+                        return False
+            except FileNotFoundError:
+                pass
+            self._write(items, data=data)
+        return True
+
+    @staticmethod
+    def _next_id(index: Any) -> int:
+        # The id scan runs at most once per parse; _write hands the result on
+        # to the snapshot it installs, so later creates skip it
+        if index.max_id is None:
+            index.max_id = max(index.by_id, default=0)
+        return index.max_id + 1
+
+    def _snapshot(self) -> Tuple[List[Dict[str, Any]], Any]:
+        # Parsed items and their index, cached together until the file's
+        # (inode, mtime_ns, size) changes. Stat before reading so a concurrent
+        # write can only make the cached key stale, never the data. Both are
+        # shared: callers build new lists/dicts instead of mutating them.
+        key = self._file_key()
+        cached = self._cache
+        if key is not None and cached is not None and cached[0] == key:
+            return cached[1], cached[2]
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            items = _parse_json_file(self.file_path)
         except FileNotFoundError:
-            return []
-        except json.JSONDecodeError as exc:
+            items = []
+        except orjson.JSONDecodeError as exc:
             raise RepositoryError(f"Invalid JSON in {self.file_path}") from exc
+        index = self._build_index(items)
+        if key is not None:
+            self._cache = (key, items, index)
+        return items, index
 
-    def _write(self, items: List[Dict[str, Any]]) -> None:
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(items, f, ensure_ascii=False, indent=2)
+    def _read(self) -> List[Dict[str, Any]]:
+        return self._snapshot()[0]
+
+    def _get_index(self) -> Any:
+        return self._snapshot()[1]
+
+    @staticmethod
+    def _encode(items: List[Dict[str, Any]]) -> bytes:
+        # Encode up front so the file is written in one call instead of one
+        # small write per token
+        return orjson.dumps(items, option=orjson.OPT_INDENT_2)
+
+    def _write(self, items: List[Dict[str, Any]], max_id: Optional[int] = None, data: Optional[bytes] = None) -> None:
+        # `max_id` is the highest id in `items` when the caller knows it;
+        # `data` is `items` already encoded
+        self._cache = None
+        if data is None:
+            data = self._encode(items)
+        # Write a sibling temp file and rename it over the original, so a crash
+        # mid-write leaves the previous contents intact
+        tmp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                # The rename keeps inode, mtime and size, so this is the key
+                # the file will have once it is in place
+                stat = os.fstat(f.fileno())
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+        # Serve the next read or create from what was just written instead of
+        # parsing the file again
+        index = self._build_index(items)
+        index.max_id = max_id
+        self._cache = ((stat.st_ino, stat.st_mtime_ns, stat.st_size), items, index)
 
 
 class JsonRoomsRepository(JsonFileRepositoryMixin, RoomsRepository):
     def __init__(self, file_path: Optional[str] = None) -> None:
-        self.file_path = file_path or settings.JSON_ROOMS_PATH
+        self._init_file(file_path or settings.JSON_ROOMS_PATH)
+
+    @staticmethod
+    def _normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        # {**record, ...} keeps the keys in their existing order
+        return {**record, "id": int(record["id"]), "name": str(record["name"])}
+
+    def _build_index(self, items: List[Dict[str, Any]]) -> RoomsIndex:
+        rooms = [Room(r["id"], r["name"]) for r in items]
+        by_id = {room.id: position for position, room in enumerate(rooms)}
+        return RoomsIndex(rooms=rooms, by_id=by_id)
 
     def list(self) -> List[Room]:
-        rooms_raw = self._read()
-        normalized: List[Room] = []
-        for r in rooms_raw:
-            normalized.append(Room(id=int(r.get("id")), name=str(r.get("name"))))
-        return normalized
+        return list(self._get_index().rooms)
 
-    def get(self, room_id: int) -> Optional[Room]:
-        for r in self._read():
-            if int(r.get("id")) == int(room_id):
-                return Room(id=int(r.get("id")), name=str(r.get("name")))
-        return None
+    def get_many(self, ids: Iterable[int]) -> List[Room]:
+        index: RoomsIndex = self._get_index()
+        positions = {index.by_id[i] for i in _int_set(ids) if i in index.by_id}
+        return [index.rooms[p] for p in sorted(positions)]
+
+    def existing_ids(self, ids: Iterable[int]) -> AbstractSet[int]:
+        by_id = self._get_index().by_id
+        return frozenset(i for i in _int_set(ids) if i in by_id)
 
-    def _next_id(self, rooms: List[Dict[str, Any]]) -> int:
-        return (max((r["id"] for r in rooms), default=0) + 1)
+    def exists(self, room_id: int) -> bool:
+        return int(room_id) in self._get_index().by_id
+
+    def get(self, room_id: int) -> Optional[Room]:
+        index: RoomsIndex = self._get_index()
+        position = index.by_id.get(room_id)
+        return index.rooms[position] if position is not None else None
 
     def create(self, name: str) -> Room:
-        rooms = self._read()
-        room = {"id": self._next_id(rooms), "name": name}
-        rooms.append(room)
-        self._write(rooms)
-        return Room(id=int(room["id"]), name=str(room["name"]))
+        with self._lock:
+            # The highest id is found once per parse and kept on the index
+            rooms, index = self._snapshot()
+            room = {"id": self._next_id(index), "name": name}
+            self._write([*rooms, room], max_id=room["id"])
+        return Room(room["id"], name)
 
     def update(self, room_id: int, name: str) -> Optional[Room]:
-        rooms = self._read()
-        for r in rooms:
-            if r.get("id") == room_id:
-                r["name"] = name
-                self._write(rooms)
-                return Room(id=int(r["id"]), name=str(r["name"]))
-        return None
+        with self._lock:
+            items, index = self._snapshot()
+            position = index.by_id.get(room_id)
+            if position is None:
+                return None
+            rooms = list(items)
+            rooms[position] = {**rooms[position], "name": name}
+            self._write(rooms, max_id=index.max_id)
+        return Room(room_id, name)
 
     def delete(self, room_id: int) -> bool:
-        rooms = self._read()
-        new_rooms = [r for r in rooms if r.get("id") != room_id]
-        if len(new_rooms) == len(rooms):
-            return False
-        self._write(new_rooms)
+        with self._lock:
+            items, index = self._snapshot()
+            position = index.by_id.get(room_id)
+            if position is None:
+                return False
+            self._write(items[:position] + items[position + 1:])
         return True
 
 
 class JsonStudentsRepository(JsonFileRepositoryMixin, StudentsRepository):
     def __init__(self, file_path: Optional[str] = None) -> None:
-        self.file_path = file_path or settings.JSON_STUDENTS_PATH
+        self._init_file(file_path or settings.JSON_STUDENTS_PATH)
+
+    @staticmethod
+    def _to_student(s: Dict[str, Any]) -> Student:
+        return Student(s["id"], s["name"], s["room"], s["sex"], datetime.strptime(s["birthday"], BIRTHDAY_FORMAT))
 
     def list(self, *, ids_in: Optional[Iterable[int]] = None, room_in: Optional[Iterable[int]] = None) -> List[Student]:
-        items = self._read()
-        if ids_in is not None:
-            ids_set = set(int(i) for i in ids_in)
-            items = [s for s in items if int(s.get("id")) in ids_set]
-        if room_in is not None:
-            room_set = set(int(r) for r in room_in)
-            items = [s for s in items if int(s.get("room")) in room_set]
-        normalized: List[Student] = []
-        for s in items:
-            normalized.append(
-                Student(
-                    id=int(s.get("id")),
-                    name=str(s.get("name")),
-                    room=int(s.get("room")),
-                    sex=str(s.get("sex")),
-                    birthday=datetime.strptime(str(s.get("birthday")), "%Y-%m-%dT%H:%M:%S.%f"),
-                )
-            )
-        return normalized
+        index: StudentsIndex = self._get_index()
+        return [self._to_student(index.records[p]) for p in self._positions(index, ids_in, room_in)]
+
+    @staticmethod
+    def _normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **record,
+            "id": int(record["id"]),
+            "name": str(record["name"]),
+            "room": int(record["room"]),
+            "sex": str(record["sex"]),
+            "birthday": str(record["birthday"]),
+        }
+
+    def _build_index(self, items: List[Dict[str, Any]]) -> StudentsIndex:
+        records = [
+            {"id": s["id"], "name": s["name"], "room": s["room"], "sex": s["sex"], "birthday": s["birthday"]}
+            for s in items
+        ]
+        by_id: Dict[int, int] = {}
+        by_room: Dict[int, List[int]] = {}
+        for position, record in enumerate(records):
+            by_id[record["id"]] = position
+            by_room.setdefault(record["room"], []).append(position)
+        return StudentsIndex(records=records, by_id=by_id, by_room=by_room)
+
+    def list_records(self, *, ids_in: Optional[Iterable[int]] = None, room_in: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        index: StudentsIndex = self._get_index()
+        if ids_in is None and room_in is None:
+            return list(index.records)
+        return [index.records[p] for p in self._positions(index, ids_in, room_in)]
+
+    @staticmethod
+    def _positions(index: StudentsIndex, ids_in: Optional[Iterable[int]], room_in: Optional[Iterable[int]]) -> Iterable[int]:
+        # Positions of the records matching both filters, in file order. The id
+        # filter is resolved through by_id and checked against the room filter
+        # in the same pass; a room filter alone goes through by_room.
+        if ids_in is None and room_in is None:
+            return range(len(index.records))
+        room_set = None if room_in is None else _int_set(room_in)
+        if ids_in is None:
+            return sorted(p for r in room_set for p in index.by_room.get(r, ()))
+        records = index.records
+        candidates = (index.by_id.get(i) for i in _int_set(ids_in))
+        return sorted(
+            p for p in candidates
+            if p is not None and (room_set is None or records[p]["room"] in room_set)
+        )
 
     def get(self, student_id: int) -> Optional[Student]:
-        for s in self._read():
-            if int(s.get("id")) == int(student_id):
-                return Student(
-                    id=int(s.get("id")),
-                    name=str(s.get("name")),
-                    room=int(s.get("room")),
-                    sex=str(s.get("sex")),
-                    birthday=datetime.strptime(str(s.get("birthday")), "%Y-%m-%dT%H:%M:%S.%f"),
-                )
-        return None
-
-    def _next_id(self, students: List[Dict[str, Any]]) -> int:
-        return (max((s["id"] for s in students), default=0) + 1)
+        index: StudentsIndex = self._get_index()
+        position = index.by_id.get(student_id)
+        return self._to_student(index.records[position]) if position is not None else None
 
     def create(self, name: str, room: int, sex: str, birthday: datetime) -> Student:
-        students = self._read()
-        student = {
-            "id": self._next_id(students),
-            "name": name,
-            "room": room,
-            "sex": sex,
-            "birthday": birthday.strftime("%Y-%m-%dT%H:%M:%S.%f"),
-        }
-        students.append(student)
-        self._write(students)
+        with self._lock:
+            students, index = self._snapshot()
+            student = {
+                "id": self._next_id(index),
+                "name": name,
+                "room": room,
+                "sex": sex,
+                "birthday": birthday.strftime(BIRTHDAY_FORMAT),
+            }
+            self._write([*students, student], max_id=student["id"])
+        return Student(student["id"], name, room, sex, birthday)
+
+    def bulk_create(self, students: List[Dict[str, Any]]) -> List[Student]:
+        with self._lock:
+            items, index = self._snapshot()
+            first_id = self._next_id(index)
+            created = [
+                Student(first_id + offset, s["name"], s["room"], s["sex"], s["birthday"])
+                for offset, s in enumerate(students)
+            ]
+            if created:
+                self._write([*items, *(student.to_dict() for student in created)], max_id=created[-1].id)
+        return created
+
+    def update(self, student_id: int, name: Optional[str] = None, room: Optional[int] = None, sex: Optional[str] = None, birthday: Optional[datetime] = None) -> Optional[Student]:
+        with self._lock:
+            items, index = self._snapshot()
+            position = index.by_id.get(student_id)
+            if position is None:
+                return None
+            s = dict(items[position])
+            if name is not None:
+                s["name"] = name
+            if room is not None:
+                s["room"] = room
+            if sex is not None:
+                s["sex"] = sex
+            if birthday is not None:
+                s["birthday"] = birthday.strftime(BIRTHDAY_FORMAT)
+            students = list(items)
+            students[position] = s
+            self._write(students, max_id=index.max_id)
+        return self._to_student(s)
+
+    def delete(self, student_id: int) -> bool:
+        with self._lock:
+            items, index = self._snapshot()
+            position = index.by_id.get(student_id)
+            if position is None:
+                return False
+            self._write(items[:position] + items[position + 1:])
+        return True
+
+    def move(self, student_id: int, to_room_id: int) -> Optional[Student]:
+        return self.update(student_id, room=to_room_id)
+
+
+class JsonCombinedRepository(CombinedRepository):
+    def __init__(self, rooms: JsonRoomsRepository, students: JsonStudentsRepository) -> None:
+        self.rooms = rooms
+        self.students = students
+        self._cache: Optional[Tuple[Any, List[Dict[str, Any]]]] = None
+
+    def fetch_combined(self) -> List[Dict[str, Any]]:
+        # Both files are already held in memory, so the joined result is kept
+        # too, until either file changes. Shared between callers; read-only.
+        key = (self.rooms._file_key(), self.students._file_key())
+        cached = self._cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        # Fresh dicts built here, so the combiner can fill them in place
+        rooms = [{"id": r.id, "name": r.name} for r in self.rooms.list()]
+        combined = DataCombiner(rooms, self.students.list_records(), reuse_rooms=True).combine()
+        self._cache = (key, combined)
+        return combined
+
+    def last_modified_ns(self) -> int:
+        return max(self.rooms.last_modified_ns(), self.students.last_modified_ns())
+
+    def version(self) -> Tuple[int, str]:
+        (rooms_ns, rooms_token), (students_ns, students_token) = self.rooms.version(), self.students.version()
+        return max(rooms_ns, students_ns), f"{rooms_token}.{students_token}"
+
+
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rooms (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    room INTEGER NOT NULL,
+    sex TEXT NOT NULL,
+    birthday TEXT NOT NULL,
+    FOREIGN KEY (room) REFERENCES rooms (id)
+);
+CREATE INDEX IF NOT EXISTS idx_students_room ON students (room);
+-- Last modification time per table, read by last_modified_ns()
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    modified_ns INTEGER NOT NULL
+);
+"""
+
+
+def connect_sqlite(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open the database, creating the schema and importing the JSON files on first use."""
+    conn = _open_sqlite(db_path, check_same_thread)
+    conn.executescript(SQLITE_SCHEMA)
+    with _transaction(conn):
+        if conn.execute("SELECT 1 FROM meta LIMIT 1").fetchone() is None:
+            _import_json(conn)
+    return conn
+
+
+def _open_sqlite(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    # Autocommit mode: reads need no transaction, writes open one explicitly
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=check_same_thread)
+    _apply_pragmas(conn, db_path)
+    return conn
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # IMMEDIATE takes the write lock up front, so concurrent writers queue on
+    # the busy timeout instead of failing when upgrading a read lock.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class ConnectionHolder:
+    """SQLite connections to one database, opened on first use.
+
+    Connections to a database file are pooled: each read or transaction
+    checks one out and hands it back when done, so pragmas and the statement
+    cache survive between requests whichever thread serves them. That suits
+    thread-per-request servers (runserver, wsgiref) and worker pools (gunicorn
+    --threads) alike; at most `pool_size` idle connections are kept and any
+    beyond that are closed on return. The first connection also creates the
+    schema. An in-memory database exists only inside the connection that
+    created it, so all threads share that one connection and take turns using
+    it under a lock.
+    """
+
+    def __init__(self, db_path: str, pool_size: Optional[int] = None) -> None:
+        self.db_path = db_path
+        self.shared = db_path == ":memory:"
+        self.pool_size = settings.SQLITE_POOL_SIZE if pool_size is None else pool_size
+        # LIFO, so the most recently used (warmest) connection goes out first
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=self.pool_size)
+        self._lock = threading.RLock()
+        self._initialized = False
+        self._shared_conn: Optional[sqlite3.Connection] = None
+
+    def _open(self) -> sqlite3.Connection:
+        # Pooled connections move between threads, one thread at a time
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    conn = connect_sqlite(self.db_path, check_same_thread=False)
+                    self._initialized = True
+                    return conn
+        return _open_sqlite(self.db_path, check_same_thread=False)
+
+    @contextmanager
+    def _checkout(self) -> Iterator[sqlite3.Connection]:
+        if self.shared:
+            with self._lock:
+                if self._shared_conn is None:
+                    self._shared_conn = self._open()
+                yield self._shared_conn
+            return
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            # Only if a rollback failed; don't hand out a connection mid-transaction
+            conn.close()
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def reading(self) -> ContextManager[sqlite3.Connection]:
+        return self._checkout()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._checkout() as conn, _transaction(conn):
+            yield conn
+
+
+@lru_cache(maxsize=None)
+def connection_holder(db_path: str) -> ConnectionHolder:
+    # Repositories on the same database share one connection pool
+    return ConnectionHolder(db_path)
+
+
+def _apply_pragmas(conn: sqlite3.Connection, db_path: str) -> None:
+    if db_path != ":memory:":
+        # WAL lets readers keep a consistent snapshot while a writer appends to
+        # the log. The mode is persistent, so this only converts the file once.
+        if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+            conn.execute("PRAGMA journal_mode=WAL")
+    # Per-connection settings. NORMAL is durable across crashes in WAL mode
+    # (only the last commits may roll back on power loss).
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+
+
+def _import_json(conn: sqlite3.Connection) -> None:
+    rooms = JsonRoomsRepository()._read()
+    students = JsonStudentsRepository()._read()
+    conn.executemany(
+        "INSERT INTO rooms (id, name) VALUES (?, ?)",
+        ((int(r.get("id")), str(r.get("name"))) for r in rooms),
+    )
+    conn.executemany(
+        "INSERT INTO students (id, name, room, sex, birthday) VALUES (?, ?, ?, ?, ?)",
+        (
+            (int(s.get("id")), str(s.get("name")), int(s.get("room")), str(s.get("sex")), str(s.get("birthday")))
+            for s in students
+        ),
+    )
+    now = time.time_ns()
+    conn.executemany("INSERT INTO meta (name, modified_ns) VALUES (?, ?)", (("rooms", now), ("students", now)))
+
+
+class SqliteRepositoryMixin:
+    db_path: str
+    table: str
+
+    def _init_connection(self, db_path: Optional[str]) -> None:
+        self.db_path = db_path or settings.SQLITE_DB_PATH
+        self._connections = connection_holder(self.db_path)
+
+    def _fetchone(self, sql: str, params: Iterable[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        with self._connections.reading() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple[Any, ...]]:
+        with self._connections.reading() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _transaction(self) -> ContextManager[sqlite3.Connection]:
+        return self._connections.transaction()
+
+    def _touch(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (name, modified_ns) VALUES (?, ?)",
+            (self.table, time.time_ns()),
+        )
+
+    def last_modified_ns(self) -> int:
+        row = self._fetchone("SELECT modified_ns FROM meta WHERE name = ?", (self.table,))
+        return int(row[0]) if row is not None else 0
+
+
+class SqliteRoomsRepository(SqliteRepositoryMixin, RoomsRepository):
+    table = "rooms"
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._init_connection(db_path)
+
+    def list(self) -> List[Room]:
+        rows = self._fetchall("SELECT id, name FROM rooms ORDER BY id")
+        return [Room(id=row[0], name=row[1]) for row in rows]
+
+    def get(self, room_id: int) -> Optional[Room]:
+        if not _in_int64(room_id):
+            return None
+        row = self._fetchone("SELECT id, name FROM rooms WHERE id = ?", (int(room_id),))
+        return Room(id=row[0], name=row[1]) if row is not None else None
+
+    def exists(self, room_id: int) -> bool:
+        if not _in_int64(room_id):
+            return False
+        row = self._fetchone("SELECT 1 FROM rooms WHERE id = ? LIMIT 1", (int(room_id),))
+        return row is not None
+
+    def get_many(self, ids: Iterable[int]) -> List[Room]:
+        rows = self._fetchall(
+            "SELECT id, name FROM rooms WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id",
+            (orjson.dumps(list(_int_set(ids))),),
+        )
+        return [Room(id=row[0], name=row[1]) for row in rows]
+
+    def existing_ids(self, ids: Iterable[int]) -> AbstractSet[int]:
+        rows = self._fetchall(
+            "SELECT id FROM rooms WHERE id IN (SELECT value FROM json_each(?))",
+            (orjson.dumps(list(_int_set(ids))),),
+        )
+        return frozenset(row[0] for row in rows)
+
+    def create(self, name: str) -> Room:
+        with self._transaction() as conn:
+            room_id = conn.execute("INSERT INTO rooms (name) VALUES (?)", (name,)).lastrowid
+            self._touch(conn)
+        return Room(id=int(room_id), name=name)
+
+    def update(self, room_id: int, name: str) -> Optional[Room]:
+        if not _in_int64(room_id):
+            return None
+        with self._transaction() as conn:
+            updated = conn.execute("UPDATE rooms SET name = ? WHERE id = ?", (name, room_id)).rowcount
+            if updated:
+                self._touch(conn)
+        return Room(id=room_id, name=name) if updated else None
+
+    def delete(self, room_id: int) -> bool:
+        if not _in_int64(room_id):
+            return False
+        with self._transaction() as conn:
+            deleted = conn.execute("DELETE FROM rooms WHERE id = ?", (room_id,)).rowcount
+            if deleted:
+                self._touch(conn)
+        return bool(deleted)
+
+
+class SqliteStudentsRepository(SqliteRepositoryMixin, StudentsRepository):
+    table = "students"
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._init_connection(db_path)
+
+    @staticmethod
+    def _where(ids_in: Optional[Iterable[int]], room_in: Optional[Iterable[int]]) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if ids_in is not None:
+            clauses.append("id IN (SELECT value FROM json_each(?))")
+            params.append(orjson.dumps(list(_int_set(ids_in))))
+        if room_in is not None:
+            clauses.append("room IN (SELECT value FROM json_each(?))")
+            params.append(orjson.dumps(list(_int_set(room_in))))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _select(self, ids_in: Optional[Iterable[int]], room_in: Optional[Iterable[int]]) -> List[Tuple[Any, ...]]:
+        where, params = self._where(ids_in, room_in)
+        return self._fetchall(
+            f"SELECT id, name, room, sex, birthday FROM students{where} ORDER BY id", params
+        )
+
+    @staticmethod
+    def _to_student(row: Tuple[Any, ...]) -> Student:
         return Student(
-            id=int(student["id"]),
-            name=str(student["name"]),
-            room=int(student["room"]),
-            sex=str(student["sex"]),
-            birthday=datetime.strptime(str(student["birthday"]), "%Y-%m-%dT%H:%M:%S.%f"),
+            id=row[0],
+            name=row[1],
+            room=row[2],
+            sex=row[3],
+            birthday=datetime.strptime(row[4], BIRTHDAY_FORMAT),
         )
 
+    def list(self, *, ids_in: Optional[Iterable[int]] = None, room_in: Optional[Iterable[int]] = None) -> List[Student]:
+        return [self._to_student(row) for row in self._select(ids_in, room_in)]
+
+    def list_records(self, *, ids_in: Optional[Iterable[int]] = None, room_in: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        return [
+            {"id": row[0], "name": row[1], "room": row[2], "sex": row[3], "birthday": row[4]}
+            for row in self._select(ids_in, room_in)
+        ]
+
+    def get(self, student_id: int) -> Optional[Student]:
+        if not _in_int64(student_id):
+            return None
+        row = self._fetchone(
+            "SELECT id, name, room, sex, birthday FROM students WHERE id = ?", (int(student_id),)
+        )
+        return self._to_student(row) if row is not None else None
+
+    def create(self, name: str, room: int, sex: str, birthday: datetime) -> Student:
+        birthday_raw = birthday.strftime(BIRTHDAY_FORMAT)
+        with self._transaction() as conn:
+            student_id = conn.execute(
+                "INSERT INTO students (name, room, sex, birthday) VALUES (?, ?, ?, ?)",
+                (name, room, sex, birthday_raw),
+            ).lastrowid
+            self._touch(conn)
+        return self._to_student((int(student_id), name, room, sex, birthday_raw))
+
+    def bulk_create(self, students: List[Dict[str, Any]]) -> List[Student]:
+        rows = [(s["name"], s["room"], s["sex"], s["birthday"].strftime(BIRTHDAY_FORMAT)) for s in students]
+        with self._transaction() as conn:
+            # BEGIN IMMEDIATE holds the write lock, so the ids after the current
+            # maximum stay free until commit; one executemany, one commit.
+            first_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM students").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO students (id, name, room, sex, birthday) VALUES (?, ?, ?, ?, ?)",
+                ((first_id + offset, *row) for offset, row in enumerate(rows)),
+            )
+            if rows:
+                self._touch(conn)
+        return [self._to_student((first_id + offset, *row)) for offset, row in enumerate(rows)]
+
     def update(self, student_id: int, name: Optional[str] = None, room: Optional[int] = None, sex: Optional[str] = None, birthday: Optional[datetime] = None) -> Optional[Student]:
-        students = self._read()
-        for s in students:
-            if s.get("id") == student_id:
-                if name is not None:
-                    s["name"] = name
-                if room is not None:
-                    s["room"] = room
-                if sex is not None:
-                    s["sex"] = sex
-                if birthday is not None:
-                    s["birthday"] = birthday.strftime("%Y-%m-%dT%H:%M:%S.%f")
-                self._write(students)
-                return Student(
-                    id=int(s["id"]),
-                    name=str(s["name"]),
-                    room=int(s.get("room")),
-                    sex=str(s.get("sex")),
-                    birthday=datetime.strptime(str(s.get("birthday")), "%Y-%m-%dT%H:%M:%S.%f"),
-                )
-        return None
+        changes: Dict[str, Any] = {"name": name, "room": room, "sex": sex}
+        if birthday is not None:
+            changes["birthday"] = birthday.strftime(BIRTHDAY_FORMAT)
+        changes = {column: value for column, value in changes.items() if value is not None}
+        if not _in_int64(student_id):
+            return None
+        with self._transaction() as conn:
+            if changes:
+                assignments = ", ".join(f"{column} = ?" for column in changes)
+                if not conn.execute(f"UPDATE students SET {assignments} WHERE id = ?", (*changes.values(), student_id)).rowcount:
+                    return None
+                self._touch(conn)
+            row = conn.execute("SELECT id, name, room, sex, birthday FROM students WHERE id = ?", (student_id,)).fetchone()
+        return self._to_student(row) if row is not None else None
 
     def delete(self, student_id: int) -> bool:
-        students = self._read()
-        new_students = [s for s in students if s.get("id") != student_id]
-        if len(new_students) == len(students):
+        if not _in_int64(student_id):
             return False
-        self._write(new_students)
-        return True
+        with self._transaction() as conn:
+            deleted = conn.execute("DELETE FROM students WHERE id = ?", (student_id,)).rowcount
+            if deleted:
+                self._touch(conn)
+        return bool(deleted)
 
     def move(self, student_id: int, to_room_id: int) -> Optional[Student]:
         return self.update(student_id, room=to_room_id)
 
 
+COMBINED_SQL = (
+    "SELECT r.id, r.name, s.id, s.name FROM rooms r "
+    "LEFT JOIN students s ON s.room = r.id ORDER BY r.id, s.id"
+)
+
+
+class SqliteCombinedRepository(SqliteRepositoryMixin, CombinedRepository):
+    table = "combined"
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._init_connection(db_path)
+
+    def fetch_combined(self) -> List[Dict[str, Any]]:
+        return list(self.iter_combined())
+
+    def iter_combined(self) -> Iterator[Dict[str, Any]]:
+        # One LEFT JOIN walked in room order straight off the cursor; the
+        # pooled connection stays checked out until the last room is yielded.
+        if self._connections.shared:
+            # Not streamed: that would hold the shared connection for the
+            # whole response
+            yield from self._group_rooms(self._fetchall(COMBINED_SQL))
+            return
+        with self._connections.reading() as conn, closing(conn.execute(COMBINED_SQL)) as rows:
+            yield from self._group_rooms(rows)
+
+    @staticmethod
+    def _group_rooms(rows: Iterable[Tuple[Any, ...]]) -> Iterator[Dict[str, Any]]:
+        # Rows arrive grouped by room, so each room is yielded as soon as it
+        # is complete and only one room is held in memory at a time
+        room: Optional[Dict[str, Any]] = None
+        for room_id, room_name, student_id, student_name in rows:
+            if room is None or room_id != room["id"]:
+                if room is not None:
+                    yield room
+                room = {"id": room_id, "name": room_name, "students": []}
+            if student_id is not None:
+                room["students"].append({"id": student_id, "name": student_name})
+        if room is not None:
+            yield room
+
+    def last_modified_ns(self) -> int:
+        row = self._fetchone("SELECT MAX(modified_ns) FROM meta")
+        return int(row[0]) if row[0] is not None else 0
+
+
+def build_repositories() -> Tuple[RoomsRepository, StudentsRepository, CombinedRepository]:
+    backend = settings.REPOSITORY_BACKEND
+    if backend == "json":
+        rooms, students = JsonRoomsRepository(), JsonStudentsRepository()
+        return rooms, students, JsonCombinedRepository(rooms, students)
+    if backend == "sqlite":
+        return SqliteRoomsRepository(), SqliteStudentsRepository(), SqliteCombinedRepository()
+    raise ImproperlyConfigured(f"Unknown REPOSITORY_BACKEND {backend!r}; expected 'json' or 'sqlite'")
+
+
 class DataCombiner:
-    def __init__(self, rooms: List[Dict[str, Any]], students: List[Dict[str, Any]]):
+    # With reuse_rooms=True the room dicts themselves receive the "students"
+    # key instead of being copied. Only for rooms the caller owns: data from
+    # JsonDataLoader or the repository caches is shared and must not change.
+    # Rooms sharing an id collapse into one entry, in the position of the
+    # first and with the fields of the last, as with a dict keyed by id.
+    def __init__(self, rooms: List[Dict[str, Any]], students: List[Dict[str, Any]], reuse_rooms: bool = False):
         self.rooms = rooms
         self.students = students
+        self.reuse_rooms = reuse_rooms
 
     def combine(self) -> List[Dict[str, Any]]:
-        room_dict = {room['id']: {'id': room['id'], 'name': room['name'], 'students': []}
-                     for room in self.rooms}
-
+        # Group students by room in one pass, then emit each room once with
+        # its group; no per-room placeholder dicts are built upfront.
+        by_room: Dict[int, List[Dict[str, Any]]] = {}
         for student in self.students:
-            room_id = student['room']
-            if room_id in room_dict:
-                room_dict[room_id]['students'].append({
-                    'id': student['id'],
-                    'name': student['name']
-                })
+            group = by_room.get(student['room'])
+            if group is None:
+                group = by_room[student['room']] = []
+            group.append({'id': student['id'], 'name': student['name']})
+
+        rooms = {room['id']: room for room in self.rooms}.values()
+        if self.reuse_rooms:
+            for room in rooms:
+                room['students'] = by_room.get(room['id']) or []
+            return list(rooms)
+
+        return [
+            {'id': room['id'], 'name': room['name'], 'students': by_room.get(room['id']) or []}
+            for room in rooms
+        ]
+
 
-        return list(room_dict.values())
+@lru_cache(maxsize=8)
+def _load_json_cached(file_path: str, mtime_ns: int, size: int) -> List[Dict[str, Any]]:
+    return _parse_json_file(file_path)
 
 
 class JsonDataLoader:
+    # Parsed data is shared between callers until the file changes; treat it as read-only.
     def load(self, file_path: str) -> List[Dict[str, Any]]:
-        with open(file_path, 'r') as file:
-            return json.load(file)
+        stat = os.stat(file_path)
+        return _load_json_cached(file_path, stat.st_mtime_ns, stat.st_size)
 
 
@@ -1,27 +1,92 @@
 from __future__ import annotations
 
+from datetime import datetime
+
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from .repositories import BIRTHDAY_FORMAT, INT64_MAX, INT64_MIN
+
+
+SEX_CHOICES = frozenset(("M", "F"))
+
+
+class FlatSerializer(serializers.Serializer):
+    # `Serializer.get_fields` deep-copies every declared field per instance.
+    # Bound fields cannot be shared (`Field.bind` refuses to rebind), so build
+    # fresh ones straight from their constructor arguments, which are
+    # immutable for flat serializers and need no copying.
+    def get_fields(self):
+        return {
+            name: field.__class__(*field._args, **field._kwargs)
+            for name, field in self._declared_fields.items()
+        }
+
+
+class FastISODateTimeField(serializers.DateTimeField):
+    """DateTimeField that parses fixed-width YYYY-MM-DDTHH:MM:SS.ffffff input natively.
+
+    Input of that exact shape goes through `datetime.fromisoformat` (C) instead of
+    `strptime`; anything else falls back to the regular format handling.
+    """
+
+    def to_internal_value(self, value):
+        if (
+            isinstance(value, str)
+            and len(value) == 26
+            and value[4] == "-" and value[7] == "-" and value[10] == "T"
+            and value[13] == ":" and value[16] == ":" and value[19] == "."
+            and BIRTHDAY_FORMAT in getattr(self, "input_formats", ())
+        ):
+            digits = value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19] + value[20:26]
+            if digits.isascii() and digits.isdigit():
+                try:
+                    parsed = datetime.fromisoformat(value)
+                except ValueError:
+                    pass
+                else:
+                    return self.enforce_timezone(parsed)
+        return super().to_internal_value(value)
+
+
+@extend_schema_field({"type": "string", "enum": ["M", "F"]})
+class SexField(serializers.CharField):
+    """Two-valued sex field checked by set membership instead of ChoiceField's lookup tables"""
+
+    default_error_messages = {
+        "invalid_choice": serializers.ChoiceField.default_error_messages["invalid_choice"],
+    }
+
+    def run_validation(self, data=serializers.empty):
+        # Skip CharField's blank handling: "" is just another invalid choice,
+        # as it is for ChoiceField
+        return serializers.Field.run_validation(self, data)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) and data in SEX_CHOICES:
+            return data
+        self.fail("invalid_choice", input=data)
+
 
-class RoomSerializer(serializers.Serializer):
+class RoomSerializer(FlatSerializer):
     id = serializers.IntegerField(read_only=True, help_text="Unique room identifier")
     name = serializers.CharField(max_length=255, help_text="Room name")
 
 
-class StudentSerializer(serializers.Serializer):
+class StudentSerializer(FlatSerializer):
     id = serializers.IntegerField(read_only=True, help_text="Unique student identifier")
     name = serializers.CharField(max_length=255, help_text="Full name")
-    room = serializers.IntegerField(help_text="Room id the student belongs to")
-    sex = serializers.ChoiceField(choices=["M", "F"], help_text='Sex of the student: "M" or "F"')
-    birthday = serializers.DateTimeField(
-        format="%Y-%m-%dT%H:%M:%S.%f",
-        input_formats=["%Y-%m-%dT%H:%M:%S.%f"],
+    room = serializers.IntegerField(min_value=INT64_MIN, max_value=INT64_MAX, help_text="Room id the student belongs to")
+    sex = SexField(help_text='Sex of the student: "M" or "F"')
+    birthday = FastISODateTimeField(
+        format=BIRTHDAY_FORMAT,
+        input_formats=[BIRTHDAY_FORMAT],
         help_text="Birthday in ISO-like format YYYY-MM-DDTHH:MM:SS.ffffff",
     )
 
 
-class MoveStudentSerializer(serializers.Serializer):
-    to_room_id = serializers.IntegerField()
+class MoveStudentSerializer(FlatSerializer):
+    to_room_id = serializers.IntegerField(min_value=INT64_MIN, max_value=INT64_MAX)
 
 
 class ErrorResponseSerializer(serializers.Serializer):
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from django.urls import path, include
+from django.urls import path, include, register_converter
 from rest_framework.routers import DefaultRouter
 
+from .converters import SignedIntConverter
 from .views import RoomViewSet, StudentViewSet, CombinedViewSet
 
 
-router = DefaultRouter()
+# Detail routes of the room and student viewsets (lookup_value_converter)
+register_converter(SignedIntConverter, "signed_int")
+
+router = DefaultRouter(use_regex_path=False)
+# Views take no `format` argument; typed `path()` suffix routes would also show up in the schema
+router.include_format_suffixes = False
 router.register(r"rooms", RoomViewSet, basename="room")
 router.register(r"students", StudentViewSet, basename="student")
 router.register(r"combined", CombinedViewSet, basename="combined")
@@ -1,6 +1,16 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache, wraps
+from typing import Any, Callable
+
 from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.decorators import method_decorator
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views import defaults
 from rest_framework import status
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -8,12 +18,8 @@ from rest_framework.viewsets import ViewSet
 from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 
-from .repositories import (
-    JsonRoomsRepository,
-    JsonStudentsRepository,
-    DataCombiner,
-    JsonDataLoader,
-)
+from .renderers import ORJSONRenderer, iter_json_array
+from .repositories import Repository, build_repositories
 from .serializers import (
     RoomSerializer,
     StudentSerializer,
@@ -23,32 +29,122 @@ from .serializers import (
 )
 
 
-rooms_repo = JsonRoomsRepository()
-students_repo = JsonStudentsRepository()
+rooms_repo, students_repo, combined_repo = build_repositories()
+
+
+def _validators(*repos: Repository) -> tuple[str | None, int | None]:
+    # The ETag is built from each storage's version token, so it changes on
+    # every write even within the one-second resolution of Last-Modified
+    versions = [repo.version() for repo in repos]
+    newest = max(modified_ns for modified_ns, _ in versions)
+    if not newest:
+        return None, None
+    etag = 'W/"' + ".".join(token for _, token in versions) + '"'
+    return etag, newest // 1_000_000_000
+
+
+def conditional_get(*repos: Repository) -> Callable[[Callable[..., HttpResponseBase]], Callable[..., HttpResponseBase]]:
+    """Conditional GET (ETag / Last-Modified, 304 Not Modified) plus Cache-Control for a read endpoint"""
+
+    def decorator(view: Callable[..., HttpResponseBase]) -> Callable[..., HttpResponseBase]:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # Checked before the view, so a write racing the request can only
+            # make the validators older than the body, never newer
+            etag, modified = _validators(*repos)
+            response = view(request, *args, **kwargs)
+            # Validators describe the collection, so errors (a missing id, a bad
+            # filter) get neither them nor a 304
+            if not status.is_success(response.status_code):
+                return response
+            if etag is not None:
+                response.headers["ETag"] = etag
+                response.headers["Last-Modified"] = http_date(modified)
+            patch_cache_control(response, public=True, max_age=settings.API_CACHE_MAX_AGE)
+            # A 304 here keeps the validators and Cache-Control set above
+            return get_conditional_response(request, etag=etag, last_modified=modified, response=response)
+
+        return wrapper
 
+    return method_decorator(decorator)
 
-def not_found(detail: str) -> Response:
-    return Response({"code": "not_found", "message": detail}, status=status.HTTP_404_NOT_FOUND)
 
+rooms_conditional = conditional_get(rooms_repo)
+students_conditional = conditional_get(students_repo)
+room_students_conditional = conditional_get(rooms_repo, students_repo)
+combined_conditional = conditional_get(combined_repo)
+
+
+_error_renderer = ORJSONRenderer()
+
+
+# Fixed error payloads are rendered once per process and served as plain
+# HttpResponses, skipping content negotiation and rendering. The response
+# objects themselves are built per request: Django and its middleware
+# mutate them, so they cannot be shared.
+@lru_cache(maxsize=None)
+def _error_body(code: str, message: str, parameter_name: str | None = None) -> bytes:
+    payload: dict[str, Any] = {"code": code, "message": message}
+    if parameter_name is not None:
+        payload["details"] = {parameter_name: ["Expected comma-separated integers."]}
+    return _error_renderer.render(payload)
+
+
+def error_response(code: str, message: str, status_code: int, parameter_name: str | None = None) -> HttpResponse:
+    return HttpResponse(
+        _error_body(code, message, parameter_name),
+        status=status_code,
+        content_type=_error_renderer.media_type,
+    )
 
-def parse_comma_separated_integers(raw_value: str, parameter_name: str) -> tuple[list[int] | None, Response | None]:
-    try:
-        values = [int(x) for x in raw_value.split(",") if x.strip()]
-        return values, None
-    except ValueError:
-        return None, Response(
-            {
-                "code": "validation_error",
-                "message": "Invalid query parameter",
-                "details": {parameter_name: ["Expected comma-separated integers."]},
-            },
-            status=400,
-        )
+
+def not_found(detail: str) -> HttpResponse:
+    return error_response("not_found", detail, status.HTTP_404_NOT_FOUND)
+
+
+def page_not_found(request, exception: Exception | None = None) -> HttpResponse:
+    # handler404: unresolved API paths (such as /api/rooms/abc/) keep the JSON
+    # error body; other paths get Django's default page
+    if request.path_info.startswith("/api/"):
+        return not_found("Not found")
+    return defaults.page_not_found(request, exception)
+
+
+def room_not_found() -> HttpResponse:
+    return error_response("room_not_found", "Target room does not exist", status.HTTP_400_BAD_REQUEST)
+
+
+def no_content() -> HttpResponse:
+    # Nothing to render, so skip DRF's Response machinery entirely. Like DRF's
+    # empty Response, send no Content-Type for the body that isn't there.
+    response = HttpResponse(status=status.HTTP_204_NO_CONTENT)
+    del response["Content-Type"]
+    return response
+
+
+# Comma-separated integers; blank items (e.g. "1,,2" or "1,") are allowed and skipped
+_INTEGER_LIST_RE = re.compile(r"\s*(?:[+-]?\d+\s*)?(?:,\s*(?:[+-]?\d+\s*)?)*")
+_INTEGER_RE = re.compile(r"[+-]?\d+")
+
+
+def parse_comma_separated_integers(raw_value: str, parameter_name: str) -> tuple[frozenset[int] | None, HttpResponse | None]:
+    # A frozenset is handed to the repositories as-is, without another set build
+    if _INTEGER_LIST_RE.fullmatch(raw_value):
+        try:
+            return frozenset(map(int, _INTEGER_RE.findall(raw_value))), None
+        except ValueError:
+            # Integers longer than sys.get_int_max_str_digits()
+            pass
+    return None, error_response("validation_error", "Invalid query parameter", status.HTTP_400_BAD_REQUEST, parameter_name)
 
 
 class RoomViewSet(ViewSet):
     """Rooms endpoint group"""
 
+    lookup_url_kwarg = "room_id"
+    lookup_value_converter = "signed_int"
+    renderer_classes = [ORJSONRenderer]
+
     @extend_schema(
         tags=["rooms"],
         summary="List rooms",
@@ -75,17 +171,17 @@ class RoomViewSet(ViewSet):
             ),
         ],
     )
-    def list(self, request: Request) -> Response:
+    @rooms_conditional
+    def list(self, request: Request) -> HttpResponse:
         ids_in_param = request.query_params.get("ids__in")
-        rooms = rooms_repo.list()
         if ids_in_param:
-            ids_list, error = parse_comma_separated_integers(ids_in_param, "ids__in")
+            ids, error = parse_comma_separated_integers(ids_in_param, "ids__in")
             if error is not None:
                 return error
-            ids_set = set(ids_list or [])
-            rooms = [r for r in rooms if r.id in ids_set]
-        serializer = RoomSerializer(rooms, many=True)
-        return Response(serializer.data)
+            rooms = rooms_repo.get_many(ids)
+        else:
+            rooms = rooms_repo.list()
+        return Response([r.to_dict() for r in rooms])
 
     @extend_schema(
         tags=["rooms"],
@@ -108,12 +204,12 @@ class RoomViewSet(ViewSet):
             ),
         ],
     )
-    def create(self, request: Request) -> Response:
+    def create(self, request: Request) -> HttpResponse:
         serializer = RoomSerializer(data=request.data)
         if not serializer.is_valid():
             return Response({"code": "validation_error", "message": "Invalid room data", "details": serializer.errors}, status=400)
         created = rooms_repo.create(name=serializer.validated_data["name"])
-        return Response(RoomSerializer(created).data, status=status.HTTP_201_CREATED)
+        return Response(created.to_dict(), status=status.HTTP_201_CREATED)
 
     @extend_schema(
         tags=["rooms"],
@@ -129,12 +225,12 @@ class RoomViewSet(ViewSet):
             )
         ],
     )
-    def retrieve(self, request: Request, pk: str | None = None) -> Response:
-        room_id = int(pk) if pk is not None else 0
+    @rooms_conditional
+    def retrieve(self, request: Request, room_id: int) -> HttpResponse:
         room = rooms_repo.get(room_id)
         if not room:
             return not_found("Room not found")
-        return Response(RoomSerializer(room).data)
+        return Response(room.to_dict())
 
     @extend_schema(
         tags=["rooms"],
@@ -161,15 +257,14 @@ class RoomViewSet(ViewSet):
             ),
         ],
     )
-    def update(self, request: Request, pk: str | None = None) -> Response:
-        room_id = int(pk) if pk is not None else 0
+    def update(self, request: Request, room_id: int) -> HttpResponse:
         serializer = RoomSerializer(data=request.data)
         if not serializer.is_valid():
             return Response({"code": "validation_error", "message": "Invalid room data", "details": serializer.errors}, status=400)
         updated = rooms_repo.update(room_id, name=serializer.validated_data["name"])
         if not updated:
             return not_found("Room not found")
-        return Response(RoomSerializer(updated).data)
+        return Response(updated.to_dict())
 
     @extend_schema(
         tags=["rooms"],
@@ -185,12 +280,11 @@ class RoomViewSet(ViewSet):
             )
         ],
     )
-    def destroy(self, request: Request, pk: str | None = None) -> Response:
-        room_id = int(pk) if pk is not None else 0
+    def destroy(self, request: Request, room_id: int) -> HttpResponse:
         deleted = rooms_repo.delete(room_id)
         if not deleted:
             return not_found("Room not found")
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return no_content()
 
     @extend_schema(
         tags=["rooms"],
@@ -220,17 +314,20 @@ class RoomViewSet(ViewSet):
         ],
     )
     @action(detail=True, methods=["get"], url_path="students")
-    def students(self, request: Request, pk: str | None = None) -> Response:
-        room_id = int(pk) if pk is not None else 0
-        if not rooms_repo.get(room_id):
+    @room_students_conditional
+    def students(self, request: Request, room_id: int) -> HttpResponse:
+        if not rooms_repo.exists(room_id):
             return not_found("Room not found")
-        students = students_repo.list(room_in=[room_id])
-        return Response(StudentSerializer(students, many=True).data)
+        return Response(students_repo.list_records(room_in=[room_id]))
 
 
 class StudentViewSet(ViewSet):
     """Students endpoint group"""
 
+    lookup_url_kwarg = "student_id"
+    lookup_value_converter = "signed_int"
+    renderer_classes = [ORJSONRenderer]
+
     @extend_schema(
         tags=["students"],
         summary="List students",
@@ -276,7 +373,8 @@ class StudentViewSet(ViewSet):
             ),
         ],
     )
-    def list(self, request: Request) -> Response:
+    @students_conditional
+    def list(self, request: Request) -> HttpResponse:
         ids_in = request.query_params.get("ids__in")
         room_in = request.query_params.get("room__in")
         ids = None
@@ -289,8 +387,7 @@ class StudentViewSet(ViewSet):
             rooms, error = parse_comma_separated_integers(room_in, "room__in")
             if error is not None:
                 return error
-        students = students_repo.list(ids_in=ids, room_in=rooms)
-        return Response(StudentSerializer(students, many=True).data)
+        return Response(students_repo.list_records(ids_in=ids, room_in=rooms))
 
     @extend_schema(
         tags=["students"],
@@ -344,14 +441,14 @@ class StudentViewSet(ViewSet):
             ),
         ],
     )
-    def create(self, request: Request) -> Response:
+    def create(self, request: Request) -> HttpResponse:
         serializer = StudentSerializer(data=request.data)
         if not serializer.is_valid():
             return Response({"code": "validation_error", "message": "Invalid student data", "details": serializer.errors}, status=400)
-        if not rooms_repo.get(serializer.validated_data["room"]):
-            return Response({"code": "room_not_found", "message": "Target room does not exist"}, status=400)
+        if not rooms_repo.exists(serializer.validated_data["room"]):
+            return room_not_found()
         created = students_repo.create(**serializer.validated_data)
-        return Response(StudentSerializer(created).data, status=status.HTTP_201_CREATED)
+        return Response(created.to_dict(), status=status.HTTP_201_CREATED)
 
     @extend_schema(
         tags=["students"],
@@ -367,12 +464,12 @@ class StudentViewSet(ViewSet):
             )
         ],
     )
-    def retrieve(self, request: Request, pk: str | None = None) -> Response:
-        student_id = int(pk) if pk is not None else 0
+    @students_conditional
+    def retrieve(self, request: Request, student_id: int) -> HttpResponse:
         student = students_repo.get(student_id)
         if not student:
             return not_found("Student not found")
-        return Response(StudentSerializer(student).data)
+        return Response(student.to_dict())
 
     @extend_schema(
         tags=["students"],
@@ -419,17 +516,16 @@ class StudentViewSet(ViewSet):
             ),
         ],
     )
-    def update(self, request: Request, pk: str | None = None) -> Response:
-        student_id = int(pk) if pk is not None else 0
+    def update(self, request: Request, student_id: int) -> HttpResponse:
         serializer = StudentSerializer(data=request.data)
         if not serializer.is_valid():
             return Response({"code": "validation_error", "message": "Invalid student data", "details": serializer.errors}, status=400)
-        if not rooms_repo.get(serializer.validated_data["room"]):
-            return Response({"code": "room_not_found", "message": "Target room does not exist"}, status=400)
+        if not rooms_repo.exists(serializer.validated_data["room"]):
+            return room_not_found()
         updated = students_repo.update(student_id, **serializer.validated_data)
         if not updated:
             return not_found("Student not found")
-        return Response(StudentSerializer(updated).data)
+        return Response(updated.to_dict())
 
     @extend_schema(
         tags=["students"],
@@ -445,12 +541,11 @@ class StudentViewSet(ViewSet):
             )
         ],
     )
-    def destroy(self, request: Request, pk: str | None = None) -> Response:
-        student_id = int(pk) if pk is not None else 0
+    def destroy(self, request: Request, student_id: int) -> HttpResponse:
         deleted = students_repo.delete(student_id)
         if not deleted:
             return not_found("Student not found")
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return no_content()
 
     @extend_schema(
         tags=["students"],
@@ -496,8 +591,7 @@ class StudentViewSet(ViewSet):
         ],
     )
     @action(detail=True, methods=["post"], url_path="move")
-    def move(self, request: Request, pk: str | None = None) -> Response:
-        student_id = int(pk) if pk is not None else 0
+    def move(self, request: Request, student_id: int) -> HttpResponse:
         student = students_repo.get(student_id)
         if not student:
             return not_found("Student not found")
@@ -505,15 +599,75 @@ class StudentViewSet(ViewSet):
         if not serializer.is_valid():
             return Response({"code": "validation_error", "message": "Invalid move payload", "details": serializer.errors}, status=400)
         to_room_id = serializer.validated_data["to_room_id"]
-        if not rooms_repo.get(to_room_id):
-            return Response({"code": "room_not_found", "message": "Target room does not exist"}, status=400)
+        if not rooms_repo.exists(to_room_id):
+            return room_not_found()
         moved = students_repo.move(student_id, to_room_id)
-        return Response(StudentSerializer(moved).data)
+        return Response(moved.to_dict())
+
+    @extend_schema(
+        tags=["students"],
+        summary="Create students in bulk",
+        description="Create several students at once. All of them are stored in a single write, or none if any item is invalid.",
+        request=StudentSerializer(many=True),
+        responses={201: StudentSerializer(many=True), 400: ErrorResponseSerializer},
+        examples=[
+            OpenApiExample(
+                "Bulk create request",
+                request_only=True,
+                value=[
+                    {"birthday": "2011-08-22T00:00:00.000000", "name": "Peggy Ryan", "room": 473, "sex": "M"},
+                    {"birthday": "2004-01-07T00:00:00.000000", "name": "Christian Bush", "room": 743, "sex": "M"},
+                ],
+            ),
+            OpenApiExample(
+                "Bulk create validation error",
+                response_only=True,
+                status_codes=["400"],
+                value={
+                    "code": "validation_error",
+                    "message": "Invalid student data",
+                    "details": {"1": {"sex": ["X is not a valid choice."]}},
+                },
+            ),
+            OpenApiExample(
+                "Bulk create room not found",
+                response_only=True,
+                status_codes=["400"],
+                value={
+                    "code": "room_not_found",
+                    "message": "Target room does not exist",
+                    "details": {"room": ["Room 743 does not exist."]},
+                },
+            ),
+        ],
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request: Request) -> HttpResponse:
+        serializer = StudentSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            # Item errors are keyed by the int index of the item; JSON keys are strings
+            details = {str(key): errors for key, errors in serializer.errors.items()}
+            return Response({"code": "validation_error", "message": "Invalid student data", "details": details}, status=400)
+        room_ids = frozenset(item["room"] for item in serializer.validated_data)
+        missing = room_ids - rooms_repo.existing_ids(room_ids)
+        if missing:
+            return Response(
+                {
+                    "code": "room_not_found",
+                    "message": "Target room does not exist",
+                    "details": {"room": [f"Room {room_id} does not exist." for room_id in sorted(missing)]},
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        created = students_repo.bulk_create(serializer.validated_data)
+        return Response([student.to_dict() for student in created], status=status.HTTP_201_CREATED)
 
 
 class CombinedViewSet(ViewSet):
     """combined endpoint group"""
 
+    renderer_classes = [ORJSONRenderer]
+
     @extend_schema(
         tags=["student_room"],
         summary="Combined rooms with students",
@@ -549,10 +703,10 @@ class CombinedViewSet(ViewSet):
             )
         ],
     )
-    def list(self, request: Request) -> Response:
-        rooms = JsonDataLoader().load(settings.JSON_ROOMS_PATH)
-        students = JsonDataLoader().load(settings.JSON_STUDENTS_PATH)
-        combined = DataCombiner(rooms, students).combine()
-        return Response(combined)
+    @combined_conditional
+    def list(self, request: Request) -> HttpResponseBase:
+        # Encoded room by room while the response is written out, so the
+        # full JSON document never has to exist in memory at once
+        return StreamingHttpResponse(iter_json_array(combined_repo.iter_combined()), content_type=ORJSONRenderer.media_type)
 
 
@@ -12,10 +12,15 @@ ALLOWED_HOSTS: list[str] = [
     "*",
 ]
 
+# Swagger UI / OpenAPI schema endpoints; always on in DEBUG. When off,
+# drf_spectacular is not installed either, so its app (which loads all of its
+# extensions on startup) stays out of the process.
+SCHEMA_ENABLED = DEBUG or os.environ.get("DJANGO_ENABLE_SCHEMA", "0") == "1"
+
 INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
-    "drf_spectacular",
+    *(["drf_spectacular"] if SCHEMA_ENABLED else []),
     "api",
 ]
 
@@ -61,7 +66,9 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+    ],
     "DEFAULT_AUTHENTICATION_CLASSES": [],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
@@ -70,15 +77,35 @@ REST_FRAMEWORK = {
     "UNAUTHENTICATED_USER": None,
     "UNAUTHENTICATED_TOKEN": None,
 }
+if SCHEMA_ENABLED:
+    REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"] = "drf_spectacular.openapi.AutoSchema"
+
+# Cache-Control max-age (seconds) for the read endpoints; the default of 0
+# makes clients revalidate every time, which ETag/Last-Modified keep cheap
+API_CACHE_MAX_AGE = int(os.environ.get("DJANGO_API_CACHE_MAX_AGE", "0"))
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Students & Rooms API",
     "DESCRIPTION": "CRUD over JSON for students and rooms, with move and combined view",
     "VERSION": "1.0.0",
+    # Detail ids use the api app's signed_int path converter
+    "PATH_CONVERTER_OVERRIDES": {"signed_int": int},
 }
 
-# JSON storage paths
+# Storage backend for rooms and students: "json" or "sqlite"
+REPOSITORY_BACKEND = os.environ.get("DJANGO_REPOSITORY_BACKEND", "json")
+
+# JSON storage paths (also the initial data for a new SQLite database)
 JSON_ROOMS_PATH = str(BASE_DIR / "input" / "rooms.json")
 JSON_STUDENTS_PATH = str(BASE_DIR / "input" / "students.json")
 
+# fsync JSON files before replacing them; set DJANGO_JSON_FSYNC=0 to skip it in development
+JSON_FSYNC = os.environ.get("DJANGO_JSON_FSYNC", "1") == "1"
+
+# SQLite storage path
+SQLITE_DB_PATH = os.environ.get("DJANGO_SQLITE_DB_PATH", str(BASE_DIR / "data.sqlite3"))
+
+# Idle SQLite connections kept open for reuse; roughly the number of server threads
+SQLITE_POOL_SIZE = int(os.environ.get("DJANGO_SQLITE_POOL_SIZE", "8"))
+
 
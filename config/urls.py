@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
 
-urlpatterns = [
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
+urlpatterns = []
+
+if settings.SCHEMA_ENABLED:
+    # Imported only when the schema is served, to keep it off production startup
+    from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+    urlpatterns += [
+        path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+        path(
+            "api/docs/",
+            SpectacularSwaggerView.as_view(url_name="schema"),
+            name="swagger-ui",
+        ),
+    ]
+
+urlpatterns += [
     path("api/", include("api.urls")),
 ]
 
-
+# Only used with DEBUG off; DEBUG shows Django's technical 404 page instead
+handler404 = "api.views.page_not_found"